@@ -7,17 +7,23 @@ It will keep move log.
 class GameState:
     def __init__(self):
         """
-        Board is an 8x8 2d list, each element in list has 2 characters.
+        Board is a flat list of 64 squares in row-major order, so square (r, c) is board[r*8 + c].
+        Each element has 2 characters.
         The first character represents the color of the piece: 'b' or 'w'.
         The second character represents the type of the piece: 'R', 'N', 'B', 'Q', 'K' or 'p'.
         "--" represents an empty space with no piece.
         """
         self.board = [
-            ["bR", "bN", "bB", "bQ", "bK", "bB", "bN", "bR"],
-            ["bP", "bP", "bP", "bP", "bP", "bP", "bP", "bP"],
-            ["--", "--", "--", "--", "--", "--", "--", "--"],
-            ["--", "--", "--", "--", "--", "--", "--", "--"],
-            ["--", "--", "--", "--", "--", "--", "--", "--"],
-            ["--", "--", "--", "--", "--", "--", "--", "--"],
-            ["wP", "wP", "wP", "wP", "wP", "wP", "wP", "wP"],
-            ["wR", "wN", "wB", "wQ", "wK", "wB", "wN", "wR"]]
+            "bR", "bN", "bB", "bQ", "bK", "bB", "bN", "bR",
+            "bP", "bP", "bP", "bP", "bP", "bP", "bP", "bP",
+            "--", "--", "--", "--", "--", "--", "--", "--",
+            "--", "--", "--", "--", "--", "--", "--", "--",
+            "--", "--", "--", "--", "--", "--", "--", "--",
+            "--", "--", "--", "--", "--", "--", "--", "--",
+            "wP", "wP", "wP", "wP", "wP", "wP", "wP", "wP",
+            "wR", "wN", "wB", "wQ", "wK", "wB", "wN", "wR"]
+        self.moveLog = []
+        # flat board indexes (r*8 + c) of every square the last move changed, so the view can
+        # repaint just those. From and to, plus the rook's squares when castling and the
+        # captured pawn's square for en passant. Set it whenever a move is logged.
+        self.lastMoveSquares = ()
@@ -3,37 +3,138 @@ Main driver file.
 Handling user input.
 """
 
+import os
 import pygame as p
 import ChessEngine
 
 WIDTH = HEIGHT = 720
 DIMENSION = 8
 SQ_SIZE = HEIGHT // DIMENSION
-MAX_FPS = 60
+MAX_FPS = 30  # chess has no animation yet; raise only while animating.
 IMAGES = {}
+# square rects and colors never change, so build them once instead of every frame.
+# RECTS is flat and indexed like the board: square (r, c) is RECTS[r*DIMENSION + c].
+RECTS = [p.Rect(c*SQ_SIZE, r*SQ_SIZE, SQ_SIZE, SQ_SIZE) for r in range(DIMENSION) for c in range(DIMENSION)]
+SQ_COLORS = (p.Color("white"), p.Color("grey"))
+BOARD_BG = None
+COLORKEY = (255, 0, 255)
+# pygame-ce's fblits() runs the whole blit loop in C without building a return list.
+HAS_FBLITS = hasattr(p.Surface, "fblits")
 
 
 def loadImages():
   pieces = ['wP', 'wR', 'wN', 'wB', 'wK', 'wQ', 'bP', 'bR', 'bN', 'bB', 'bK', 'bQ']
+  # scaled copies are cached on disk per SQ_SIZE so later runs skip the rescale.
+  cacheDir = "_scaled_cache/" + str(SQ_SIZE) + "/"
+  # convert() and convert_alpha() need the display mode to be set, so call this after set_mode.
   for piece in pieces:
-    IMAGES[piece] = p.transform.scale(p.image.load("images/" + piece + ".png"), (SQ_SIZE, SQ_SIZE))
+    source = "images/" + piece + ".png"
+    img = loadCachedPiece(source, cacheDir + piece)
+    if img is None:
+      img = scalePiece(source, cacheDir + piece)
+    IMAGES[piece] = img
+
+
+# hard-edged pieces are cached as <piece>.key.png (opaque, COLORKEY background),
+# anti-aliased ones as <piece>.png; returns None when no usable cached copy exists.
+def loadCachedPiece(source, cacheBase):
+  for suffix in (".key.png", ".png"):
+    cached = cacheBase + suffix
+    # a cached copy older than its source is stale; an unreadable one is rebuilt.
+    if not os.path.exists(cached) or os.path.getmtime(cached) < os.path.getmtime(source):
+      continue
+    try:
+      img = p.image.load(cached)
+    except p.error:
+      continue
+    if suffix == ".key.png":
+      img = img.convert()
+      img.set_colorkey(COLORKEY, p.RLEACCEL)
+      return img
+    return img.convert_alpha()
+  return None
+
+
+# scaling the source to SQ_SIZE and caching the result. A piece whose source alpha is only
+# 0 or 255 is scaled nearest-neighbour, which keeps its edges hard, and then colorkeyed:
+# that blits faster than per-pixel alpha. Anti-aliased art keeps smoothscale and alpha.
+def scalePiece(source, cacheBase):
+  img = p.image.load(source).convert_alpha()
+  if p.mask.from_surface(img, 0).count() == p.mask.from_surface(img, 254).count():
+    scaled = p.transform.scale(img, (SQ_SIZE, SQ_SIZE))
+    img = p.Surface((SQ_SIZE, SQ_SIZE)).convert()
+    img.fill(COLORKEY)
+    img.blit(scaled, (0, 0))
+    img.set_colorkey(COLORKEY, p.RLEACCEL)
+    cached = cacheBase + ".key.png"
+  else:
+    img = p.transform.smoothscale(img, (SQ_SIZE, SQ_SIZE))
+    cached = cacheBase + ".png"
+  # save under a temp name and move it into place, so an interrupted
+  # run never leaves a truncated cache file.
+  tmp = cacheBase + ".tmp.png"
+  try:
+    os.makedirs(os.path.dirname(cacheBase), exist_ok=True)
+    p.image.save(img, tmp)
+    os.replace(tmp, cached)
+  except (OSError, p.error):
+    pass  # a read-only checkout just rescales every run.
+  return img
+
+
+# rasterizing the squares once into a surface, so a frame only needs one blit for the board.
+def loadBoard():
+  global BOARD_BG
+  BOARD_BG = p.Surface((WIDTH, HEIGHT)).convert()
+  drawRect, colors, rects = p.draw.rect, SQ_COLORS, RECTS
+  # (r ^ c) & 1 matches (r + c) % 2 for board coordinates; r, c come straight from the flat index.
+  for i in range(DIMENSION * DIMENSION):
+    r, c = divmod(i, DIMENSION)
+    drawRect(BOARD_BG, colors[(r ^ c) & 1], rects[i])
 
 
 def main():
-  p.init()
+  # double buffering saves a frame of input latency.
+  os.environ.setdefault("SDL_VIDEO_DOUBLE_BUFFER", "1")
+  # only the display is used; p.init() would also bring up audio and joystick support.
+  # add p.font.init() here once text (e.g. a move log) is drawn.
+  p.display.init()
+  # no SCALED: it makes display.update(rects) present the whole window
+  # and lets SDL resize the window on HiDPI screens.
   screen = p.display.set_mode((WIDTH, HEIGHT))
   clock = p.time.Clock()
   screen.fill(p.Color("white"))
   gs = ChessEngine.GameState()
   loadImages()
+  loadBoard()
   running = True
+  # only redraw when a move was made or the window needs repainting.
+  lastMoveCount = -1
+  needsRedraw = True
   while running:
-    for e in p.event.get():
-      if e.type == p.QUIT:
-        running = False
-    drawGameState(screen,gs)
+    # peek() answers with a bool, so an idle frame allocates no event list.
+    # When real input handling lands, pull just those types with event.get(eventtype=[...]).
+    p.event.pump()
+    if p.event.peek(p.QUIT, pump=False):
+      running = False
+    if p.event.peek((p.VIDEOEXPOSE, p.WINDOWEXPOSED), pump=False):
+      needsRedraw = True
+    p.event.clear(pump=False)
+    moveCount = len(gs.moveLog)
+    if moveCount != lastMoveCount:
+      # incremental path only for exactly one new move; several moves, an undo or a reset
+      # can touch other squares, so those get a full redraw.
+      if not needsRedraw and moveCount == lastMoveCount + 1 and gs.lastMoveSquares:
+        drawSquares(screen, gs.board, gs.lastMoveSquares)
+        p.display.update([RECTS[i] for i in gs.lastMoveSquares])
+      else:
+        needsRedraw = True
+      lastMoveCount = moveCount
+    if needsRedraw:
+      drawGameState(screen,gs)
+      p.display.update()
+      needsRedraw = False
     clock.tick(MAX_FPS)
-    p.display.flip()     
 
 def drawGameState(screen,gs):
     drawBoard(screen)
@@ -41,20 +142,29 @@ def drawGameState(screen,gs):
 
 # drawing the squares on the board.
 def drawBoard(screen):
-  colors = [p.Color("white"),p.Color("grey")]
-  for r in range(DIMENSION):
-    for c in range(DIMENSION):
-      color = colors[((r+c)%2)]
-      p.draw.rect(screen, color, p.Rect(c*SQ_SIZE, r*SQ_SIZE,SQ_SIZE,SQ_SIZE))
+  screen.blit(BOARD_BG, (0, 0))
 
 
 
+# drawing the pieces in one batched blits() call instead of one blit per piece.
 def drawPices(screen,board):
-  for r in range(DIMENSION):
-    for c in range(DIMENSION):
-      piece = board[r][c]
-      if piece != "--":
-        screen.blit(IMAGES[piece], p.Rect(c*SQ_SIZE, r*SQ_SIZE,SQ_SIZE,SQ_SIZE))
+  # bind globals to locals so the comprehension avoids a dict lookup per square.
+  images, rects = IMAGES, RECTS
+  blitSeq = [(images[piece], rects[i]) for i, piece in enumerate(board) if piece != "--"]
+  if HAS_FBLITS:
+    screen.fblits(blitSeq)
+  else:
+    screen.blits(blitSeq, doreturn=0)
+
+# redrawing only the given flat-indexed squares, background first and then the piece.
+def drawSquares(screen,board,squares):
+  blit, bg, images, rects = screen.blit, BOARD_BG, IMAGES, RECTS
+  for i in squares:
+    rect = rects[i]
+    blit(bg, rect, area=rect)
+    piece = board[i]
+    if piece != "--":
+      blit(images[piece], rect)
 
 
 if __name__ == "__main__":